@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
 import csv
+import os
 import time
 import argparse
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime
 from rich.console import Console
 from rich.table import Table
 from rich.layout import Layout
@@ -13,42 +14,132 @@ from rich.text import Text
 
 console = Console()
 
-def load_csv_data(csv_path):
-    """Load data from CSV file"""
+# Live-view read state per CSV path: inode, bytes consumed, last line, header and latest rows
+_TAIL_STATE = {}
+
+# Numeric CSV columns the viewer renders and the type each one is parsed into;
+# other columns, such as pool_difficulty, stay as read
+NUMERIC_FIELDS = {
+    'hashrate_gh': float,
+    'temperature': float,
+    'power_w': float,
+    'uptime_s': int,
+    'accepted_shares': int,
+    'rejected_shares': int,
+}
+
+def is_complete_row(row):
+    """Check that every numeric field the viewer renders has a value in a CSV row"""
+    return all(row.get(field) for field in NUMERIC_FIELDS)
+
+def convert_numeric_fields(row):
+    """Convert a complete CSV row's numeric fields in place"""
+    for field, convert in NUMERIC_FIELDS.items():
+        row[field] = convert(row[field])
+    return row
+
+def select_latest_rows(rows, latest=None):
+    """Pick each miner's newest complete row, keeping only rows newer than those in latest"""
+    latest = latest or {}
+    updated = {}
+    for row in rows:
+        # Skip rows with missing cells, such as a half-written last line
+        if not is_complete_row(row):
+            continue
+        miner_ip = row['miner_ip']
+        current = updated.get(miner_ip) or latest.get(miner_ip)
+        if current is None or row['timestamp'] > current['timestamp']:
+            updated[miner_ip] = row
+    
+    # Only the rows that are kept need their numeric fields converted
+    for row in updated.values():
+        convert_numeric_fields(row)
+    
+    return updated
+
+def load_latest_metrics(csv_path):
+    """Load the latest metrics for each miner in a single pass over the CSV"""
     if not Path(csv_path).exists():
-        return []
+        return {}
     
-    data = []
     with open(csv_path, 'r') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            # Convert numeric fields
-            row['hashrate_gh'] = float(row['hashrate_gh'])
-            row['temperature'] = float(row['temperature'])
-            row['power_w'] = float(row['power_w'])
-            row['uptime_s'] = int(row['uptime_s'])
-            row['accepted_shares'] = int(row['accepted_shares'])
-            row['rejected_shares'] = int(row['rejected_shares'])
-            row['pool_difficulty'] = int(row['pool_difficulty'])
-            data.append(row)
-    
-    return data
-
-def get_latest_metrics(data):
-    """Get the latest metrics for each miner"""
-    if not data:
+        return select_latest_rows(csv.DictReader(f))
+
+def _new_tail_state(inode):
+    """Create empty live-view read state for one CSV file"""
+    return {'inode': inode, 'offset': 0, 'last_line': b'', 'fieldnames': None, 'latest': {}}
+
+def _read_complete_lines(f, state):
+    """Yield decoded lines from the read position, advancing the state past each one"""
+    for line in f:
+        # Leave a partially written last line for the next call
+        if not line.endswith(b'\n'):
+            break
+        state['offset'] += len(line)
+        state['last_line'] = line
+        yield line.decode('utf-8')
+
+def load_latest_metrics_incremental(csv_path):
+    """Load the latest metrics, parsing only the rows appended since the last call"""
+    key = os.path.abspath(csv_path)
+    try:
+        stat = os.stat(key)
+    except FileNotFoundError:
+        _TAIL_STATE.pop(key, None)
         return {}
     
-    latest = {}
-    for row in data:
-        miner_ip = row['miner_ip']
-        if miner_ip not in latest or row['timestamp'] > latest[miner_ip]['timestamp']:
-            latest[miner_ip] = row
+    # Start over when the file was replaced or shrank below what was read
+    state = _TAIL_STATE.get(key)
+    if state is None or state['inode'] != stat.st_ino or stat.st_size < state['offset']:
+        state = _TAIL_STATE[key] = _new_tail_state(stat.st_ino)
+    
+    if stat.st_size == state['offset']:
+        return state['latest']
+    
+    with open(key, 'rb') as f:
+        # A file truncated and refilled past the old offset no longer has the
+        # last line read sitting just before that offset
+        last_line = state['last_line']
+        if last_line:
+            f.seek(state['offset'] - len(last_line))
+            if f.read(len(last_line)) != last_line:
+                state = _TAIL_STATE[key] = _new_tail_state(stat.st_ino)
+                f.seek(0)
+        
+        reader = csv.DictReader(_read_complete_lines(f, state), fieldnames=state['fieldnames'])
+        updated = select_latest_rows(reader, state['latest'])
+        state['fieldnames'] = reader.fieldnames
+    
+    if updated:
+        state['latest'] = {**state['latest'], **updated}
     
-    return latest
+    return state['latest']
 
-def create_summary_table(latest_metrics):
+def get_fleet_stats(latest_metrics):
+    """Aggregate fleet totals in a single pass over the latest metrics"""
+    total_hashrate = 0
+    total_power = 0
+    temp_sum = 0
+    
+    for metrics in latest_metrics.values():
+        total_hashrate += metrics['hashrate_gh']
+        total_power += metrics['power_w']
+        temp_sum += metrics['temperature']
+    
+    total_miners = len(latest_metrics)
+    
+    return {
+        'total_miners': total_miners,
+        'total_hashrate': total_hashrate,
+        'total_power': total_power,
+        'avg_temp': temp_sum / total_miners if total_miners > 0 else 0,
+    }
+
+def create_summary_table(latest_metrics, fleet_stats=None):
     """Create a summary table showing latest metrics for all miners"""
+    if fleet_stats is None:
+        fleet_stats = get_fleet_stats(latest_metrics)
+    
     table = Table(title="Bitaxe Gamma Miners - Current Status")
     
     table.add_column("Miner IP", style="cyan", no_wrap=True)
@@ -59,8 +150,7 @@ def create_summary_table(latest_metrics):
     table.add_column("Shares (A/R)", style="white")
     table.add_column("Last Update", style="dim")
     
-    total_hashrate = 0
-    total_power = 0
+    now = datetime.now()
     
     for miner_ip, metrics in latest_metrics.items():
         uptime_hours = metrics['uptime_s'] // 3600
@@ -71,14 +161,14 @@ def create_summary_table(latest_metrics):
         
         # Parse timestamp
         timestamp = datetime.fromisoformat(metrics['timestamp'])
-        time_ago = datetime.now() - timestamp
+        seconds_ago = (now - timestamp).total_seconds()
         
-        if time_ago < timedelta(minutes=1):
+        if seconds_ago < 60:
             last_update = "Just now"
-        elif time_ago < timedelta(hours=1):
-            last_update = f"{int(time_ago.total_seconds() // 60)}m ago"
+        elif seconds_ago < 3600:
+            last_update = f"{int(seconds_ago // 60)}m ago"
         else:
-            last_update = f"{int(time_ago.total_seconds() // 3600)}h ago"
+            last_update = f"{int(seconds_ago // 3600)}h ago"
         
         # Color code temperature
         temp_style = "red" if metrics['temperature'] > 80 else "yellow" if metrics['temperature'] > 70 else "green"
@@ -92,17 +182,14 @@ def create_summary_table(latest_metrics):
             shares_str,
             last_update
         )
-        
-        total_hashrate += metrics['hashrate_gh']
-        total_power += metrics['power_w']
     
     # Add totals row
     table.add_section()
     table.add_row(
         "[bold]TOTAL[/bold]",
-        f"[bold green]{total_hashrate:.1f}[/bold green]",
+        f"[bold green]{fleet_stats['total_hashrate']:.1f}[/bold green]",
         "-",
-        f"[bold blue]{total_power:.1f}[/bold blue]",
+        f"[bold blue]{fleet_stats['total_power']:.1f}[/bold blue]",
         "-",
         "-",
         "-"
@@ -114,14 +201,17 @@ def create_live_display(latest_metrics):
     """Create a live updating display layout"""
     layout = Layout()
     
+    # Fleet totals are shared by the table's totals row and the stats panel
+    fleet = get_fleet_stats(latest_metrics)
+    
     # Main content
-    main_table = create_summary_table(latest_metrics)
+    main_table = create_summary_table(latest_metrics, fleet)
     
     # Stats panel
-    total_miners = len(latest_metrics)
-    total_hashrate = sum(m['hashrate_gh'] for m in latest_metrics.values())
-    avg_temp = sum(m['temperature'] for m in latest_metrics.values()) / total_miners if total_miners > 0 else 0
-    total_power = sum(m['power_w'] for m in latest_metrics.values())
+    total_miners = fleet['total_miners']
+    total_hashrate = fleet['total_hashrate']
+    avg_temp = fleet['avg_temp']
+    total_power = fleet['total_power']
     
     stats_text = Text()
     stats_text.append(f"Fleet Overview\n", style="bold cyan")
@@ -142,12 +232,11 @@ def create_live_display(latest_metrics):
 
 def show_summary(csv_path):
     """Show summary of current miner status"""
-    data = load_csv_data(csv_path)
-    if not data:
+    latest_metrics = load_latest_metrics(csv_path)
+    if not latest_metrics:
         console.print("[red]No data found. Run collector.py first.[/red]")
         return
     
-    latest_metrics = get_latest_metrics(data)
     table = create_summary_table(latest_metrics)
     console.print(table)
 
@@ -158,9 +247,9 @@ def show_live(csv_path):
     with Live(console=console, refresh_per_second=1) as live:
         try:
             while True:
-                data = load_csv_data(csv_path)
-                if data:
-                    latest_metrics = get_latest_metrics(data)
+                # Only rows the collector appended since the last tick are parsed
+                latest_metrics = load_latest_metrics_incremental(csv_path)
+                if latest_metrics:
                     display = create_live_display(latest_metrics)
                     live.update(display)
                 else:
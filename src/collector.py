@@ -1,38 +1,87 @@
 #!/usr/bin/env python3
+import atexit
+import copy
 import csv
+import math
 import time
 import yaml
 import requests
 import sys
 import os
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional
+from requests.adapters import HTTPAdapter
+from typing import Dict, Any, List, Optional, TextIO, Tuple, Union
 
-def load_config():
-    """Load and validate configuration from config.yaml"""
-    # Support running from project root or src directory
-    config_paths = ['config/config.yaml', '../config/config.yaml']
-    config_path = None
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# Open CSV handles reused across writes: absolute path -> (file, writer, inode)
+_CSV_WRITERS: Dict[str, Tuple[TextIO, csv.DictWriter, int]] = {}
+
+# CSV column order
+CSV_FIELDNAMES = ('timestamp', 'miner_ip', 'hashrate_gh', 'temperature',
+                  'power_w', 'uptime_s', 'accepted_shares', 'rejected_shares',
+                  'pool_difficulty')
+
+# Write buffer for cached CSV handles; each batch is flushed explicitly
+CSV_BUFFER_SIZE = 1 << 16
+
+# API field names for the hashrate, in order of preference
+HASHRATE_FIELDS = ('hashRate', 'hashrateGHs', 'currentHashrate')
+
+# Output metric -> (API field names in order of preference, min, max, decimals).
+# Metrics with no decimals are stored as integers.
+METRIC_FIELDS = (
+    ('temperature', ('temp', 'temperature'), -50, 150, 1),
+    ('power_w', ('power', 'powerConsumption'), 0, 1000, 1),
+    ('uptime_s', ('uptimeSeconds', 'uptime'), 0, None, None),
+    ('accepted_shares', ('sharesAccepted', 'acceptedShares'), 0, None, None),
+    ('rejected_shares', ('sharesRejected', 'rejectedShares'), 0, None, None),
+    ('pool_difficulty', ('stratumDifficulty', 'difficulty'), 0, None, None),
+)
+
+# Parsed configs keyed by absolute path, stored with the (mtime_ns, size)
+# they were parsed at so an edited file is re-read on the next load
+_CONFIG_CACHE: "OrderedDict[str, Tuple[int, int, Dict[str, Any]]]" = OrderedDict()
+_CONFIG_CACHE_MAX = 100
+
+def load_config(config_path: Optional[str] = None):
+    """Load and validate configuration from config.yaml, or from config_path if given"""
+    if config_path is not None:
+        config_paths = [config_path]
+    else:
+        # Support running from project root or src directory
+        config_paths = ['config/config.yaml', '../config/config.yaml']
     
-    for path in config_paths:
-        if os.path.exists(path):
-            config_path = path
+    # Open each candidate directly; a missing file is the only case that moves on
+    for config_path in config_paths:
+        try:
+            with open(config_path, 'r', encoding='utf-8') as f:
+                cache_key = os.path.abspath(config_path)
+                stat = os.fstat(f.fileno())
+                file_version = (stat.st_mtime_ns, stat.st_size)
+                
+                cached = _CONFIG_CACHE.get(cache_key)
+                if cached is not None and cached[:2] == file_version:
+                    _CONFIG_CACHE.move_to_end(cache_key)
+                    return copy.deepcopy(cached[2])
+                
+                config = yaml.load(f, Loader=_YamlLoader)
             break
-    
-    if config_path is None:
+        except FileNotFoundError:
+            continue
+        except yaml.YAMLError as e:
+            raise ValueError(f"Invalid YAML in config file: {e}")
+        except Exception as e:
+            raise ValueError(f"Error reading config file: {e}")
+    else:
         raise FileNotFoundError(f"Configuration file not found. Tried: {', '.join(config_paths)}")
     
-    # config_path is already validated above
-    
-    try:
-        with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
-    except yaml.YAMLError as e:
-        raise ValueError(f"Invalid YAML in config file: {e}")
-    except Exception as e:
-        raise ValueError(f"Error reading config file: {e}")
-    
     # Validate required fields
     required_fields = ['miners', 'poll_interval', 'csv_path']
     for field in required_fields:
@@ -53,6 +102,12 @@ def load_config():
     config.setdefault('retry_delay', 2)
     config.setdefault('data_validation', True)
     
+    # Only validated configs are cached; callers get their own copy to mutate
+    _CONFIG_CACHE[cache_key] = (*file_version, copy.deepcopy(config))
+    _CONFIG_CACHE.move_to_end(cache_key)
+    if len(_CONFIG_CACHE) > _CONFIG_CACHE_MAX:
+        _CONFIG_CACHE.popitem(last=False)
+    
     return config
 
 def validate_numeric_value(value: Any, field_name: str, min_val: float = None, max_val: float = None, default: float = 0.0) -> float:
@@ -63,16 +118,10 @@ def validate_numeric_value(value: Any, field_name: str, min_val: float = None, m
     try:
         num_value = float(value)
         
-        # Check for invalid values
-        if not (isinstance(num_value, (int, float)) and not (isinstance(num_value, bool))):
-            raise ValueError(f"Invalid numeric type for {field_name}")
-        
-        # Check for NaN or infinity
-        if not (num_value == num_value):  # NaN check
-            raise ValueError(f"NaN value for {field_name}")
-        
-        if abs(num_value) == float('inf'):
-            raise ValueError(f"Infinite value for {field_name}")
+        # Check for NaN or infinity in one test; only the failure path tells them apart
+        if not math.isfinite(num_value):
+            kind = "NaN" if math.isnan(num_value) else "Infinite"
+            raise ValueError(f"{kind} value for {field_name}")
         
         # Range validation
         if min_val is not None and num_value < min_val:
@@ -89,10 +138,17 @@ def validate_numeric_value(value: Any, field_name: str, min_val: float = None, m
         print(f"Warning: Invalid {field_name} value '{value}': {e}. Using default {default}")
         return default
 
+def get_first_field(data: Dict[str, Any], field_names: Tuple[str, ...], default: Any = 0) -> Any:
+    """Return the value of the first field name present in the API response"""
+    for field_name in field_names:
+        if field_name in data:
+            return data[field_name]
+    return default
+
 def validate_and_sanitize_metrics(data: Dict[str, Any], miner_ip: str) -> Dict[str, Any]:
     """Validate and sanitize metrics data"""
     # Handle different field name variations
-    hashrate_raw = data.get('hashRate', data.get('hashrateGHs', data.get('currentHashrate', 0)))
+    hashrate_raw = get_first_field(data, HASHRATE_FIELDS)
     
     # Convert hashrate units if necessary
     hashrate_validated = validate_numeric_value(hashrate_raw, 'hashrate_raw', 0, None, 0)
@@ -101,46 +157,39 @@ def validate_and_sanitize_metrics(data: Dict[str, Any], miner_ip: str) -> Dict[s
     else:  # Already in GH/s
         hashrate_gh = validate_numeric_value(hashrate_validated, 'hashrate_gh', 0, 10000, 0)
     
-    # Validate and sanitize all metrics
     metrics = {
         'timestamp': datetime.now().isoformat(),
         'miner_ip': str(miner_ip),
         'hashrate_gh': round(hashrate_gh, 2),
-        'temperature': round(validate_numeric_value(
-            data.get('temp', data.get('temperature', 0)), 
-            'temperature', -50, 150, 0
-        ), 1),
-        'power_w': round(validate_numeric_value(
-            data.get('power', data.get('powerConsumption', 0)), 
-            'power_w', 0, 1000, 0
-        ), 1),
-        'uptime_s': int(validate_numeric_value(
-            data.get('uptimeSeconds', data.get('uptime', 0)), 
-            'uptime_s', 0, None, 0
-        )),
-        'accepted_shares': int(validate_numeric_value(
-            data.get('sharesAccepted', data.get('acceptedShares', 0)), 
-            'accepted_shares', 0, None, 0
-        )),
-        'rejected_shares': int(validate_numeric_value(
-            data.get('sharesRejected', data.get('rejectedShares', 0)), 
-            'rejected_shares', 0, None, 0
-        )),
-        'pool_difficulty': int(validate_numeric_value(
-            data.get('stratumDifficulty', data.get('difficulty', 0)), 
-            'pool_difficulty', 0, None, 0
-        )),
     }
     
+    # Validate and sanitize all remaining metrics
+    for name, field_names, min_val, max_val, ndigits in METRIC_FIELDS:
+        value = validate_numeric_value(get_first_field(data, field_names), name, min_val, max_val, 0)
+        metrics[name] = int(value) if ndigits is None else round(value, ndigits)
+    
     return metrics
 
-def collect_metrics(miner_ip: str, timeout: int = 10, validate_data: bool = True) -> Dict[str, Any]:
+def create_http_session(host_count: int) -> requests.Session:
+    """Create a requests session that keeps one connection per miner alive between polls"""
+    session = requests.Session()
+    # pool_connections is how many per-host pools stay cached, so it must cover
+    # every miner; each miner gets one request at a time, so one connection each
+    adapter = HTTPAdapter(pool_connections=host_count, pool_maxsize=1)
+    session.mount('http://', adapter)
+    return session
+
+def collect_metrics(miner_ip: str, timeout: int = 10, validate_data: bool = True,
+                    session: Optional[requests.Session] = None) -> Dict[str, Any]:
     """
     Collect metrics from a Bitaxe Gamma miner via API.
+    Pass a session from create_http_session to reuse connections between polls.
     """
+    http = session if session is not None else requests
+    
     try:
         # Make API request to /api/system/info endpoint
-        response = requests.get(
+        response = http.get(
             f"http://{miner_ip}/api/system/info",
             timeout=timeout,
             headers={'User-Agent': 'BitaxeMonitor/1.0'}
@@ -154,7 +203,7 @@ def collect_metrics(miner_ip: str, timeout: int = 10, validate_data: bool = True
             metrics = validate_and_sanitize_metrics(data, miner_ip)
         else:
             # Basic extraction without validation (fallback mode)
-            hashrate_raw = data.get('hashRate', data.get('hashrateGHs', data.get('currentHashrate', 0)))
+            hashrate_raw = get_first_field(data, HASHRATE_FIELDS)
             if hashrate_raw > 1000:
                 hashrate_gh = round(hashrate_raw / 1000, 2)
             else:
@@ -164,13 +213,10 @@ def collect_metrics(miner_ip: str, timeout: int = 10, validate_data: bool = True
                 'timestamp': datetime.now().isoformat(),
                 'miner_ip': miner_ip,
                 'hashrate_gh': hashrate_gh,
-                'temperature': round(data.get('temp', data.get('temperature', 0)), 1),
-                'power_w': round(data.get('power', data.get('powerConsumption', 0)), 1),
-                'uptime_s': data.get('uptimeSeconds', data.get('uptime', 0)),
-                'accepted_shares': data.get('sharesAccepted', data.get('acceptedShares', 0)),
-                'rejected_shares': data.get('sharesRejected', data.get('rejectedShares', 0)),
-                'pool_difficulty': data.get('stratumDifficulty', data.get('difficulty', 0)),
             }
+            for name, field_names, _, _, ndigits in METRIC_FIELDS:
+                value = get_first_field(data, field_names)
+                metrics[name] = value if ndigits is None else round(value, ndigits)
         
         return metrics
         
@@ -204,40 +250,93 @@ def collect_metrics_with_retry(miner_ip: str, max_retries: int = 3, retry_delay:
     
     return None
 
-def write_to_csv(data: Dict[str, Any], csv_path: str) -> bool:
-    """Write metrics data to CSV file with error handling"""
+def _new_csv_writer(f: TextIO) -> csv.DictWriter:
+    """Create a DictWriter on an open CSV stream, adding the header at the start of the stream"""
+    writer = csv.DictWriter(f, fieldnames=CSV_FIELDNAMES)
+    
+    # Append mode starts at end of file, so position 0 means a new or empty file
+    if f.tell() == 0:
+        writer.writeheader()
+    
+    return writer
+
+def _get_csv_writer(csv_file: Path) -> Tuple[TextIO, csv.DictWriter]:
+    """Return the cached handle and writer for a CSV path, opening it if needed"""
+    key = os.path.abspath(csv_file)
+    cached = _CSV_WRITERS.get(key)
+    
+    if cached is not None:
+        f, writer, inode = cached
+        # Keep the handle only while the path still points at the file we opened
+        try:
+            stat = os.stat(key)
+        except FileNotFoundError:
+            stat = None
+        if stat is not None and stat.st_ino == inode:
+            # Truncating in place (copytruncate, > file) keeps the inode but drops the header
+            if stat.st_size == 0:
+                writer.writeheader()
+            return f, writer
+        close_csv_writer(key)
+    
+    # Create the directory only when the open finds it missing
     try:
-        csv_file = Path(csv_path)
-        file_exists = csv_file.exists()
-        
-        # Ensure directory exists
+        f = open(csv_file, 'a', buffering=CSV_BUFFER_SIZE, newline='', encoding='utf-8')
+    except FileNotFoundError:
         csv_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(csv_path, 'a', newline='', encoding='utf-8') as f:
-            fieldnames = ['timestamp', 'miner_ip', 'hashrate_gh', 'temperature', 
-                         'power_w', 'uptime_s', 'accepted_shares', 'rejected_shares', 
-                         'pool_difficulty']
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            
-            if not file_exists:
-                writer.writeheader()
-            
-            writer.writerow(data)
-            f.flush()  # Ensure data is written immediately
+        f = open(csv_file, 'a', buffering=CSV_BUFFER_SIZE, newline='', encoding='utf-8')
+    
+    writer = _new_csv_writer(f)
+    _CSV_WRITERS[key] = (f, writer, os.fstat(f.fileno()).st_ino)
+    return f, writer
+
+def close_csv_writer(csv_path: Union[str, os.PathLike]) -> None:
+    """Close the cached handle for a CSV path, if one is open"""
+    cached = _CSV_WRITERS.pop(os.path.abspath(csv_path), None)
+    if cached is not None:
+        cached[0].close()
+
+def close_csv_writers() -> None:
+    """Close every cached CSV handle"""
+    for key in list(_CSV_WRITERS):
+        close_csv_writer(key)
+
+atexit.register(close_csv_writers)
+
+def write_rows_to_csv(rows: List[Dict[str, Any]], dest: Union[str, os.PathLike, TextIO]) -> bool:
+    """Append a batch of metrics rows to a CSV file path or open text stream"""
+    try:
+        if isinstance(dest, (str, os.PathLike)):
+            f, writer = _get_csv_writer(Path(dest))
+            try:
+                writer.writerows(rows)
+                f.flush()  # Ensure data is written immediately
+            except Exception:
+                # Drop the handle so the next write starts from a fresh open
+                close_csv_writer(dest)
+                raise
+        else:
+            writer = _new_csv_writer(dest)
+            writer.writerows(rows)
+            dest.flush()
             
         return True
         
     except PermissionError:
-        print(f"Permission denied writing to {csv_path}")
+        print(f"Permission denied writing to {dest}")
         return False
     except OSError as e:
-        print(f"OS error writing to {csv_path}: {e}")
+        print(f"OS error writing to {dest}: {e}")
         return False
     except Exception as e:
-        print(f"Unexpected error writing to {csv_path}: {e}")
+        print(f"Unexpected error writing to {dest}: {e}")
         return False
 
-def validate_startup_conditions(config: Dict[str, Any]) -> bool:
+def write_to_csv(data: Dict[str, Any], dest: Union[str, os.PathLike, TextIO]) -> bool:
+    """Write metrics data to CSV file with error handling"""
+    return write_rows_to_csv([data], dest)
+
+def validate_startup_conditions(config: Dict[str, Any], session: Optional[requests.Session] = None) -> bool:
     """Validate startup conditions and connectivity"""
     print("Performing startup validation...")
     
@@ -261,6 +360,7 @@ def validate_startup_conditions(config: Dict[str, Any]) -> bool:
         temp_file = csv_file.with_suffix('.tmp')
         
         if write_to_csv(test_data, str(temp_file)):
+            close_csv_writer(temp_file)
             temp_file.unlink(missing_ok=True)
             print(f"✓ CSV write permissions OK for {csv_path}")
         else:
@@ -272,6 +372,7 @@ def validate_startup_conditions(config: Dict[str, Any]) -> bool:
         return False
     
     # Test network connectivity to miners
+    http = session if session is not None else requests
     reachable_miners = []
     unreachable_miners = []
     
@@ -279,7 +380,7 @@ def validate_startup_conditions(config: Dict[str, Any]) -> bool:
         print(f"Testing connectivity to {miner_ip}...")
         try:
             # Quick connectivity test
-            response = requests.get(
+            response = http.get(
                 f"http://{miner_ip}/api/system/info",
                 timeout=config['timeout'],
                 headers={'User-Agent': 'BitaxeMonitor/1.0'}
@@ -322,8 +423,12 @@ def main():
         print(f"✗ Configuration error: {e}")
         sys.exit(1)
     
+    # One session for the whole run so each miner's TCP connection is reused
+    # across cycles; retries stay in collect_metrics_with_retry, not the adapter
+    session = create_http_session(len(config['miners']))
+    
     # Perform startup validation
-    if not validate_startup_conditions(config):
+    if not validate_startup_conditions(config, session=session):
         print("\n✗ Startup validation failed. Please fix the issues above and try again.")
         response = input("Continue anyway? (y/N): ").lower().strip()
         if response != 'y':
@@ -339,10 +444,12 @@ def main():
     # Main collection loop with enhanced error handling
     consecutive_failures = {}
     max_consecutive_failures = 5
+    cycle_metrics = []
     
     try:
         while True:
             success_count = 0
+            cycle_metrics = []
             
             for miner_ip in config['miners']:
                 try:
@@ -351,16 +458,12 @@ def main():
                         max_retries=config.get('max_retries', 3),
                         retry_delay=config.get('retry_delay', 2),
                         timeout=config.get('timeout', 10),
-                        validate_data=config.get('data_validation', True)
+                        validate_data=config.get('data_validation', True),
+                        session=session
                     )
                     
                     if metrics:
-                        if write_to_csv(metrics, config['csv_path']):
-                            print(f"✓ {miner_ip}: {metrics['hashrate_gh']} GH/s, {metrics['temperature']}°C, {metrics['power_w']}W")
-                            success_count += 1
-                            consecutive_failures[miner_ip] = 0  # Reset failure count
-                        else:
-                            print(f"✗ Failed to write data for {miner_ip}")
+                        cycle_metrics.append(metrics)
                     else:
                         consecutive_failures[miner_ip] = consecutive_failures.get(miner_ip, 0) + 1
                         if consecutive_failures[miner_ip] >= max_consecutive_failures:
@@ -370,6 +473,19 @@ def main():
                     consecutive_failures[miner_ip] = consecutive_failures.get(miner_ip, 0) + 1
                     print(f"✗ Error with {miner_ip}: {e}")
             
+            # Append the whole cycle to the CSV in one write; once handed off,
+            # the rows are no longer pending for the interrupt handler
+            if cycle_metrics:
+                rows, cycle_metrics = cycle_metrics, []
+                if write_rows_to_csv(rows, config['csv_path']):
+                    for metrics in rows:
+                        miner_ip = metrics['miner_ip']
+                        print(f"✓ {miner_ip}: {metrics['hashrate_gh']} GH/s, {metrics['temperature']}°C, {metrics['power_w']}W")
+                        success_count += 1
+                        consecutive_failures[miner_ip] = 0  # Reset failure count
+                else:
+                    print(f"✗ Failed to write data for {', '.join(m['miner_ip'] for m in rows)}")
+            
             if success_count == 0:
                 print("⚠ No successful collections this cycle")
             
@@ -377,6 +493,9 @@ def main():
             
     except KeyboardInterrupt:
         print("\nGracefully stopping collector...")
+        # Keep the rows already collected in the interrupted cycle
+        if cycle_metrics and write_rows_to_csv(cycle_metrics, config['csv_path']):
+            print(f"✓ Saved {len(cycle_metrics)} rows from the interrupted cycle")
     except Exception as e:
         print(f"\n✗ Unexpected error in main loop: {e}")
         sys.exit(1)
@@ -7,67 +7,72 @@ import requests
 import json
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
-from collector import load_config, validate_and_sanitize_metrics
+from collector import create_http_session, load_config, validate_and_sanitize_metrics
 
-def test_miner_api(miner_ip, timeout=10):
+# API fields the collector relies on, reported in the field analysis
+_EXPECTED_FIELDS = ('hashRate', 'temp', 'power', 'uptimeSeconds',
+                    'sharesAccepted', 'sharesRejected')
+
+def test_miner_api(miner_ip, timeout=10, session=None):
     """Test API connection to a single miner"""
-    print(f"\nTesting connection to {miner_ip}...")
+    # Collect the report and print it in one go so concurrent probes don't interleave
+    lines = [f"\nTesting connection to {miner_ip}..."]
+    http = session if session is not None else requests
     
     try:
-        response = requests.get(
+        response = http.get(
             f"http://{miner_ip}/api/system/info",
             timeout=timeout,
             headers={'User-Agent': 'BitaxeMonitor/1.0'}
         )
         
-        print(f"✓ HTTP Status: {response.status_code}")
+        lines.append(f"✓ HTTP Status: {response.status_code}")
         
         if response.status_code == 200:
             data = response.json()
-            print(f"✓ Response received ({len(data)} fields)")
+            lines.append(f"✓ Response received ({len(data)} fields)")
             
             # Pretty print the JSON response
-            print("\nAPI Response:")
-            print(json.dumps(data, indent=2))
+            lines.append("\nAPI Response:")
+            lines.append(json.dumps(data, indent=2))
             
             # Check for expected fields
-            expected_fields = ['hashRate', 'temp', 'power', 'uptimeSeconds', 
-                             'sharesAccepted', 'sharesRejected']
-            
-            print("\nField Analysis:")
-            for field in expected_fields:
-                value = data.get(field, "NOT FOUND")
-                print(f"  {field}: {value}")
+            lines.append("\nField Analysis:")
+            for field in _EXPECTED_FIELDS:
+                lines.append(f"  {field}: {data.get(field, 'NOT FOUND')}")
             
             # Test data validation
-            print("\nData Validation Test:")
+            lines.append("\nData Validation Test:")
             try:
                 validated_metrics = validate_and_sanitize_metrics(data, miner_ip)
-                print("✓ Data validation successful")
-                print(f"  Sanitized hashrate: {validated_metrics['hashrate_gh']} GH/s")
-                print(f"  Sanitized temperature: {validated_metrics['temperature']}°C")
-                print(f"  Sanitized power: {validated_metrics['power_w']}W")
+                lines.append("✓ Data validation successful")
+                lines.append(f"  Sanitized hashrate: {validated_metrics['hashrate_gh']} GH/s")
+                lines.append(f"  Sanitized temperature: {validated_metrics['temperature']}°C")
+                lines.append(f"  Sanitized power: {validated_metrics['power_w']}W")
             except Exception as e:
-                print(f"✗ Data validation failed: {e}")
+                lines.append(f"✗ Data validation failed: {e}")
             
             return True
         else:
-            print(f"✗ HTTP Error: {response.status_code}")
+            lines.append(f"✗ HTTP Error: {response.status_code}")
             return False
             
     except requests.exceptions.Timeout:
-        print(f"✗ Timeout connecting to {miner_ip}")
+        lines.append(f"✗ Timeout connecting to {miner_ip}")
         return False
     except requests.exceptions.ConnectionError:
-        print(f"✗ Connection failed to {miner_ip}")
+        lines.append(f"✗ Connection failed to {miner_ip}")
         return False
     except requests.exceptions.HTTPError as e:
-        print(f"✗ HTTP error: {e}")
+        lines.append(f"✗ HTTP error: {e}")
         return False
     except Exception as e:
-        print(f"✗ Unexpected error: {e}")
+        lines.append(f"✗ Unexpected error: {e}")
         return False
+    finally:
+        print("\n".join(lines))
 
 def main():
     """Test all miners from config"""
@@ -79,10 +84,13 @@ def main():
         print(f"Testing {len(miners)} miners from config.yaml...")
         print(f"Timeout: {timeout} seconds")
         
-        success_count = 0
-        for miner_ip in miners:
-            if test_miner_api(miner_ip, timeout):
-                success_count += 1
+        # Probe all miners concurrently over one pooled session
+        session = create_http_session(len(miners))
+        
+        with session, ThreadPoolExecutor(max_workers=min(32, len(miners))) as executor:
+            results = list(executor.map(lambda ip: test_miner_api(ip, timeout, session), miners))
+        
+        success_count = sum(results)
         
         print(f"\n=== Results ===")
         print(f"Successful connections: {success_count}/{len(miners)}")
@@ -0,0 +1,94 @@
+"""
+Tests for the CLI viewer's CSV loaders.
+"""
+import os
+from cli_view import load_latest_metrics, load_latest_metrics_incremental
+
+HEADER = "timestamp,miner_ip,hashrate_gh,temperature,power_w,uptime_s,accepted_shares,rejected_shares,pool_difficulty\n"
+
+def csv_row(timestamp, miner_ip, hashrate_gh):
+    """Build one complete CSV line for a miner"""
+    return f"{timestamp},{miner_ip},{hashrate_gh},75.0,20.0,3600,100,2,5000\n"
+
+def append(path, text):
+    """Append raw text to a CSV file"""
+    with open(path, 'a', newline='') as f:
+        f.write(text)
+
+def test_incomplete_rows_are_skipped(tmp_path):
+    """Test a half-written row does not become the miner's latest reading"""
+    csv_path = tmp_path / "metrics.csv"
+    csv_path.write_text(HEADER + csv_row("2024-01-01T00:00:00", "10.0.0.1", 1.2)
+                        + "2024-01-01T00:01:00,10.0.0.1,7\n")
+    
+    latest = load_latest_metrics(csv_path)
+    assert latest['10.0.0.1']['timestamp'] == "2024-01-01T00:00:00"
+    assert latest['10.0.0.1']['power_w'] == 20.0
+
+def test_empty_unrendered_cell_keeps_row(tmp_path):
+    """Test an empty pool_difficulty cell does not hide the miner"""
+    csv_path = tmp_path / "metrics.csv"
+    csv_path.write_text(HEADER + "2024-01-01T00:00:00,10.0.0.1,1.2,75.0,20.0,3600,100,2,\n")
+    
+    latest = load_latest_metrics(csv_path)
+    assert latest['10.0.0.1']['hashrate_gh'] == 1.2
+    assert latest == load_latest_metrics_incremental(csv_path)
+
+def test_incremental_appended_rows(tmp_path):
+    """Test rows appended between calls update the latest metrics"""
+    csv_path = tmp_path / "metrics.csv"
+    csv_path.write_text(HEADER + csv_row("2024-01-01T00:00:00", "10.0.0.1", 1.2)
+                        + csv_row("2024-01-01T00:00:00", "10.0.0.2", 1.1))
+    
+    latest = load_latest_metrics_incremental(csv_path)
+    assert set(latest) == {'10.0.0.1', '10.0.0.2'}
+    assert latest['10.0.0.1']['hashrate_gh'] == 1.2
+    
+    append(csv_path, csv_row("2024-01-01T00:01:00", "10.0.0.1", 1.5))
+    latest = load_latest_metrics_incremental(csv_path)
+    assert latest['10.0.0.1']['hashrate_gh'] == 1.5
+    assert latest['10.0.0.2']['hashrate_gh'] == 1.1
+    assert latest == load_latest_metrics(csv_path)
+
+def test_incremental_partial_last_line(tmp_path):
+    """Test a partially written last line is read once it is completed"""
+    csv_path = tmp_path / "metrics.csv"
+    csv_path.write_text(HEADER + csv_row("2024-01-01T00:00:00", "10.0.0.1", 1.2))
+    load_latest_metrics_incremental(csv_path)
+    
+    line = csv_row("2024-01-01T00:01:00", "10.0.0.1", 1.5)
+    append(csv_path, line[:30])
+    assert load_latest_metrics_incremental(csv_path)['10.0.0.1']['hashrate_gh'] == 1.2
+    
+    append(csv_path, line[30:])
+    assert load_latest_metrics_incremental(csv_path)['10.0.0.1']['hashrate_gh'] == 1.5
+
+def test_incremental_file_replaced(tmp_path):
+    """Test a file replaced by rename is read from the start"""
+    csv_path = tmp_path / "metrics.csv"
+    csv_path.write_text(HEADER + csv_row("2024-01-01T00:00:00", "10.0.0.1", 1.2))
+    load_latest_metrics_incremental(csv_path)
+    
+    replacement = tmp_path / "metrics.csv.new"
+    replacement.write_text(HEADER + csv_row("2024-01-01T00:00:00", "10.0.0.9", 0.9)
+                           + csv_row("2024-01-01T00:00:00", "10.0.0.8", 0.8))
+    os.replace(replacement, csv_path)
+    
+    assert set(load_latest_metrics_incremental(csv_path)) == {'10.0.0.9', '10.0.0.8'}
+
+def test_incremental_file_truncated(tmp_path):
+    """Test a file truncated in place is read from the start"""
+    csv_path = tmp_path / "metrics.csv"
+    csv_path.write_text(HEADER + csv_row("2024-01-01T00:00:00", "10.0.0.1", 1.2)
+                        + csv_row("2024-01-01T00:00:00", "10.0.0.2", 1.1))
+    load_latest_metrics_incremental(csv_path)
+    
+    # Shorter than what was already read
+    csv_path.write_text(HEADER + csv_row("2024-01-02T00:00:00", "10.0.0.3", 1.3))
+    assert set(load_latest_metrics_incremental(csv_path)) == {'10.0.0.3'}
+    
+    # Refilled past the old offset before the next call
+    csv_path.write_text(HEADER + csv_row("2024-01-03T00:00:00", "10.0.0.4", 1.4)
+                        + csv_row("2024-01-03T00:00:00", "10.0.0.5", 1.5)
+                        + csv_row("2024-01-03T00:00:00", "10.0.0.6", 1.6))
+    assert set(load_latest_metrics_incremental(csv_path)) == {'10.0.0.4', '10.0.0.5', '10.0.0.6'}
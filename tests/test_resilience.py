@@ -1,269 +1,219 @@
-#!/usr/bin/env python3
 """
 Test script to verify resilience features of the collector.
 Tests various edge cases and error conditions.
 """
-import json
-import tempfile
-import os
-import sys
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+import io
+from math import inf, nan
+import pytest
 from collector import (
+    CSV_FIELDNAMES,
+    close_csv_writer,
     validate_numeric_value, 
     validate_and_sanitize_metrics,
+    write_rows_to_csv,
     write_to_csv,
     load_config
 )
 
-def test_numeric_validation():
+# One sanitized metrics row, as the collector writes it
+SAMPLE_ROW = {
+    'timestamp': '2024-01-01T00:00:00',
+    'miner_ip': '192.168.1.100',
+    'hashrate_gh': 1.2,
+    'temperature': 75.0,
+    'power_w': 20.0,
+    'uptime_s': 3600,
+    'accepted_shares': 100,
+    'rejected_shares': 2,
+    'pool_difficulty': 5000
+}
+
+@pytest.mark.parametrize("value, field, min_val, max_val, expected", [
+    (42.5, "test", None, None, 42.5),
+    ("42.5", "test", None, None, 42.5),
+    (None, "test", None, None, 0.0),
+    ("invalid", "test", None, None, 0.0),
+    (nan, "test", None, None, 0.0),
+    (inf, "test", None, None, 0.0),
+    (-10, "test", 0, 100, 0),  # Below minimum
+    (150, "test", 0, 100, 100),  # Above maximum
+    (50, "test", 0, 100, 50),  # Within range
+])
+def test_numeric_validation(value, field, min_val, max_val, expected):
     """Test numeric value validation"""
-    print("Testing numeric validation...")
-    
-    # Test cases: (value, field_name, min_val, max_val, expected_result)
-    test_cases = [
-        (42.5, "test", None, None, 42.5),
-        ("42.5", "test", None, None, 42.5),
-        (None, "test", None, None, 0.0),
-        ("invalid", "test", None, None, 0.0),
-        (float('nan'), "test", None, None, 0.0),
-        (float('inf'), "test", None, None, 0.0),
-        (-10, "test", 0, 100, 0),  # Below minimum
-        (150, "test", 0, 100, 100),  # Above maximum
-        (50, "test", 0, 100, 50),  # Within range
-    ]
-    
-    for value, field, min_val, max_val, expected in test_cases:
-        result = validate_numeric_value(value, field, min_val, max_val)
-        status = "✓" if result == expected else "✗"
-        print(f"  {status} {field}={value} -> {result} (expected {expected})")
-    
-    print()
+    assert validate_numeric_value(value, field, min_val, max_val) == expected
 
-def test_data_sanitization():
-    """Test data sanitization with various API response formats"""
-    print("Testing data sanitization...")
-    
-    test_cases = [
-        # Normal case
+@pytest.mark.parametrize("data, expected", [
+    pytest.param(
         {
-            "name": "Normal API response",
-            "data": {
-                "hashRate": 1200.0,  # MH/s
-                "temp": 75.5,
-                "power": 20.3,
-                "uptimeSeconds": 86400,
-                "sharesAccepted": 150,
-                "sharesRejected": 2,
-                "stratumDifficulty": 5000
-            }
+            "hashRate": 1200.0,  # MH/s
+            "temp": 75.5,
+            "power": 20.3,
+            "uptimeSeconds": 86400,
+            "sharesAccepted": 150,
+            "sharesRejected": 2,
+            "stratumDifficulty": 5000
         },
-        # Alternative field names
+        {'hashrate_gh': 1.2, 'temperature': 75.5, 'power_w': 20.3, 'uptime_s': 86400,
+         'accepted_shares': 150, 'rejected_shares': 2, 'pool_difficulty': 5000},
+        id="normal-api-response",
+    ),
+    pytest.param(
         {
-            "name": "Alternative field names",
-            "data": {
-                "currentHashrate": 1.2,  # Already in GH/s
-                "temperature": 80.0,
-                "powerConsumption": 18.5,
-                "uptime": 7200,
-                "acceptedShares": 100,
-                "rejectedShares": 1,
-                "difficulty": 3000
-            }
+            "currentHashrate": 1.2,  # Already in GH/s
+            "temperature": 80.0,
+            "powerConsumption": 18.5,
+            "uptime": 7200,
+            "acceptedShares": 100,
+            "rejectedShares": 1,
+            "difficulty": 3000
         },
-        # Missing fields
+        {'hashrate_gh': 1.2, 'temperature': 80.0, 'power_w': 18.5, 'uptime_s': 7200,
+         'accepted_shares': 100, 'rejected_shares': 1, 'pool_difficulty': 3000},
+        id="alternative-field-names",
+    ),
+    pytest.param(
         {
-            "name": "Missing fields",
-            "data": {
-                "hashRate": 500.0,
-                "temp": 70.0
-                # Other fields missing
-            }
+            "hashRate": 500.0,
+            "temp": 70.0
+            # Other fields missing
         },
-        # Invalid values
+        {'hashrate_gh': 500.0, 'temperature': 70.0, 'power_w': 0.0, 'uptime_s': 0,
+         'accepted_shares': 0, 'rejected_shares': 0, 'pool_difficulty': 0},
+        id="missing-fields",
+    ),
+    pytest.param(
         {
-            "name": "Invalid values",
-            "data": {
-                "hashRate": "invalid",
-                "temp": float('nan'),
-                "power": -5.0,  # Negative power
-                "uptimeSeconds": "not_a_number",
-                "sharesAccepted": float('inf'),
-                "sharesRejected": -1,  # Negative shares
-                "stratumDifficulty": None
-            }
+            "hashRate": "invalid",
+            "temp": nan,
+            "power": -5.0,  # Negative power
+            "uptimeSeconds": "not_a_number",
+            "sharesAccepted": inf,
+            "sharesRejected": -1,  # Negative shares
+            "stratumDifficulty": None
         },
-        # Extreme values
+        {'hashrate_gh': 0.0, 'temperature': 0.0, 'power_w': 0.0, 'uptime_s': 0,
+         'accepted_shares': 0, 'rejected_shares': 0, 'pool_difficulty': 0},
+        id="invalid-values",
+    ),
+    pytest.param(
         {
-            "name": "Extreme values",
-            "data": {
-                "hashRate": 50000.0,  # Very high hashrate
-                "temp": 200.0,       # Very high temperature
-                "power": 1000.0,     # Very high power
-                "uptimeSeconds": 86400 * 365,  # One year
-                "sharesAccepted": 1000000,
-                "sharesRejected": 50000,
-                "stratumDifficulty": 100000000
-            }
-        }
-    ]
-    
-    for test_case in test_cases:
-        print(f"  Testing: {test_case['name']}")
-        try:
-            result = validate_and_sanitize_metrics(test_case['data'], "test-miner")
-            print(f"    ✓ Sanitized successfully")
-            print(f"      Hashrate: {result['hashrate_gh']} GH/s")
-            print(f"      Temperature: {result['temperature']}°C")
-            print(f"      Power: {result['power_w']}W")
-        except Exception as e:
-            print(f"    ✗ Failed: {e}")
+            "hashRate": 50000.0,  # Very high hashrate
+            "temp": 200.0,       # Very high temperature
+            "power": 1000.0,     # Very high power
+            "uptimeSeconds": 86400 * 365,  # One year
+            "sharesAccepted": 1000000,
+            "sharesRejected": 50000,
+            "stratumDifficulty": 100000000
+        },
+        {'hashrate_gh': 50.0, 'temperature': 150.0, 'power_w': 1000.0, 'uptime_s': 86400 * 365,
+         'accepted_shares': 1000000, 'rejected_shares': 50000, 'pool_difficulty': 100000000},
+        id="extreme-values",
+    ),
+])
+def test_data_sanitization(data, expected):
+    """Test data sanitization with various API response formats"""
+    result = validate_and_sanitize_metrics(data, "test-miner")
     
-    print()
+    assert result['miner_ip'] == "test-miner"
+    assert 'timestamp' in result
+    for field, value in expected.items():
+        assert result[field] == value, field
 
-def test_csv_writing():
+def test_csv_writing(tmp_path):
     """Test CSV writing with various scenarios"""
-    print("Testing CSV writing...")
+    # Row formatting checks run against an in-memory buffer
+    buf = io.StringIO()
     
-    # Test with temporary file
-    with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.csv') as tmp_file:
-        tmp_path = tmp_file.name
+    # Batched write: header + 2 data rows
+    assert write_rows_to_csv([SAMPLE_ROW, SAMPLE_ROW], buf)
+    assert buf.getvalue().count('\n') == 3
     
+    # Single-row append
+    assert write_to_csv(SAMPLE_ROW, buf)
+    assert buf.getvalue().count('\n') == 4
+    
+    # Write to non-existent directory (created automatically)
+    non_existent_path = tmp_path / "non_existent_dir" / "test.csv"
     try:
-        # Test data
-        test_data = {
-            'timestamp': '2024-01-01T00:00:00',
-            'miner_ip': '192.168.1.100',
-            'hashrate_gh': 1.2,
-            'temperature': 75.0,
-            'power_w': 20.0,
-            'uptime_s': 3600,
-            'accepted_shares': 100,
-            'rejected_shares': 2,
-            'pool_difficulty': 5000
-        }
-        
-        # Test normal write
-        success = write_to_csv(test_data, tmp_path)
-        if success:
-            print("  ✓ Normal CSV write successful")
-        else:
-            print("  ✗ Normal CSV write failed")
-        
-        # Test append
-        success = write_to_csv(test_data, tmp_path)
-        if success:
-            print("  ✓ CSV append successful")
-        else:
-            print("  ✗ CSV append failed")
-        
-        # Check file contents
-        if os.path.exists(tmp_path):
-            with open(tmp_path, 'r') as f:
-                lines = f.readlines()
-                if len(lines) == 3:  # Header + 2 data rows
-                    print("  ✓ CSV file has correct number of lines")
-                else:
-                    print(f"  ✗ CSV file has {len(lines)} lines, expected 3")
-        
+        assert write_to_csv(SAMPLE_ROW, non_existent_path)
+        assert non_existent_path.exists()
     finally:
-        # Clean up
-        if os.path.exists(tmp_path):
-            os.unlink(tmp_path)
-    
-    # Test write to non-existent directory
-    non_existent_path = "/tmp/non_existent_dir/test.csv"
-    success = write_to_csv(test_data, non_existent_path)
-    if success:
-        print("  ✓ CSV write to non-existent directory (created automatically)")
-        # Clean up
-        if os.path.exists(non_existent_path):
-            os.unlink(non_existent_path)
-            os.rmdir(os.path.dirname(non_existent_path))
-    else:
-        print("  ✗ CSV write to non-existent directory failed")
-    
-    print()
+        # Release the cached handle before pytest removes the directory
+        close_csv_writer(non_existent_path)
 
-def test_config_validation():
-    """Test configuration validation"""
-    print("Testing configuration validation...")
-    
-    # Save original config
-    original_config_path = 'config.yaml'
-    backup_path = 'config.yaml.backup'
-    
-    if os.path.exists(original_config_path):
-        os.rename(original_config_path, backup_path)
+def test_csv_header_written_once(tmp_path):
+    """Test appending to an existing CSV file does not repeat the header"""
+    csv_path = tmp_path / "metrics.csv"
+    try:
+        assert write_to_csv(SAMPLE_ROW, csv_path)
+        # Reopening finds a non-empty file and skips the header
+        close_csv_writer(csv_path)
+        assert write_to_csv(SAMPLE_ROW, csv_path)
+    finally:
+        close_csv_writer(csv_path)
     
+    header = ",".join(CSV_FIELDNAMES)
+    lines = csv_path.read_text().splitlines()
+    assert len(lines) == 3
+    assert lines[0] == header
+    assert lines.count(header) == 1
+
+def test_csv_header_rewritten_after_truncate(tmp_path):
+    """Test a CSV file truncated in place gets a new header on the next write"""
+    csv_path = tmp_path / "metrics.csv"
     try:
-        # Test missing config file
-        try:
-            load_config()
-            print("  ✗ Should have failed with missing config file")
-        except FileNotFoundError:
-            print("  ✓ Correctly detected missing config file")
-        except Exception as e:
-            print(f"  ✗ Unexpected error: {e}")
-        
-        # Test invalid YAML
-        with open(original_config_path, 'w') as f:
-            f.write("invalid: yaml: content: [")
-        
-        try:
-            load_config()
-            print("  ✗ Should have failed with invalid YAML")
-        except ValueError:
-            print("  ✓ Correctly detected invalid YAML")
-        except Exception as e:
-            print(f"  ✗ Unexpected error: {e}")
-        
-        # Test missing required fields
-        with open(original_config_path, 'w') as f:
-            f.write("poll_interval: 10\\n")  # Missing miners and csv_path
-        
-        try:
-            load_config()
-            print("  ✗ Should have failed with missing required fields")
-        except ValueError:
-            print("  ✓ Correctly detected missing required fields")
-        except Exception as e:
-            print(f"  ✗ Unexpected error: {e}")
-        
-        # Test invalid values
-        with open(original_config_path, 'w') as f:
-            f.write("""
+        assert write_to_csv(SAMPLE_ROW, csv_path)
+        # Truncate like logrotate's copytruncate while the handle stays open
+        csv_path.write_text("")
+        assert write_to_csv(SAMPLE_ROW, csv_path)
+        assert write_to_csv(SAMPLE_ROW, csv_path)
+    finally:
+        close_csv_writer(csv_path)
+    
+    lines = csv_path.read_text().splitlines()
+    assert len(lines) == 3
+    assert lines[0] == ",".join(CSV_FIELDNAMES)
+
+@pytest.mark.parametrize("content, error", [
+    pytest.param(None, FileNotFoundError, id="missing-file"),
+    pytest.param("invalid: yaml: content: [", ValueError, id="invalid-yaml"),
+    # Missing miners and csv_path
+    pytest.param("poll_interval: 10\n", ValueError, id="missing-required-fields"),
+    pytest.param("""
 miners: []
 poll_interval: -5
 csv_path: test.csv
-""")
-        
-        try:
-            load_config()
-            print("  ✗ Should have failed with invalid values")
-        except ValueError:
-            print("  ✓ Correctly detected invalid values")
-        except Exception as e:
-            print(f"  ✗ Unexpected error: {e}")
-            
-    finally:
-        # Restore original config
-        if os.path.exists(original_config_path):
-            os.unlink(original_config_path)
-        if os.path.exists(backup_path):
-            os.rename(backup_path, original_config_path)
+""", ValueError, id="invalid-values"),
+])
+def test_config_validation(tmp_path, content, error):
+    """Test configuration validation"""
+    config_path = tmp_path / "config.yaml"
+    if content is not None:
+        config_path.write_text(content)
     
-    print()
+    with pytest.raises(error):
+        load_config(str(config_path))
 
-def main():
-    """Run all resilience tests"""
-    print("=== Collector Resilience Tests ===\\n")
-    
-    test_numeric_validation()
-    test_data_sanitization()
-    test_csv_writing()
-    test_config_validation()
+def test_load_config_success(tmp_path):
+    """Test loading a valid config fills in the optional defaults"""
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("""
+miners:
+  - 192.168.1.45
+poll_interval: 10
+csv_path: data/metrics.csv
+""")
     
-    print("=== Test Suite Complete ===")
-
-if __name__ == "__main__":
-    main()
\ No newline at end of file
+    config = load_config(str(config_path))
+    assert config['miners'] == ['192.168.1.45']
+    assert config['poll_interval'] == 10
+    assert config['csv_path'] == 'data/metrics.csv'
+    assert config['timeout'] == 10
+    assert config['max_retries'] == 3
+    assert config['retry_delay'] == 2
+    assert config['data_validation'] is True
+    
+    # A cached reload must not share state with the copy the caller changed
+    config['miners'].append('192.168.1.46')
+    assert load_config(str(config_path))['miners'] == ['192.168.1.45']